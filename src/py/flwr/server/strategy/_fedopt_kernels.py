@@ -0,0 +1,91 @@
+# Copyright 2020 Adap GmbH. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Fused elementwise kernels for the FedOpt family of strategies.
+
+The server-side adaptive updates are elementwise maps over the flattened
+model weights and are bound by memory bandwidth, not FLOPs. When Numba is
+installed the whole update is compiled into a single parallel loop, so each
+element is read from and written to memory exactly once. Without Numba the
+kernels fall back to an in-place NumPy pipeline with one scratch buffer.
+Numba is an optional dependency; both paths compute identical updates.
+"""
+
+
+import math
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+
+    @njit(parallel=True, fastmath=True, cache=True)  # type: ignore
+    def _adagrad_step_jit(
+        agg: np.ndarray,
+        weights: np.ndarray,
+        v_t: np.ndarray,
+        eta: float,
+        tau: float,
+    ) -> None:
+        # pylint: disable=not-an-iterable
+        for i in prange(agg.size):
+            delta = agg[i] - weights[i]
+            v_t[i] += delta * delta
+            weights[i] += eta * delta / (math.sqrt(v_t[i]) + tau)
+
+
+except ImportError:
+    _adagrad_step_jit = None  # type: ignore
+
+
+def _adagrad_step_numpy(
+    agg: np.ndarray,
+    weights: np.ndarray,
+    v_t: np.ndarray,
+    scratch: np.ndarray,
+    eta: float,
+    tau: float,
+) -> None:
+    np.subtract(agg, weights, out=agg)
+    np.square(agg, out=scratch)
+    np.add(v_t, scratch, out=v_t)
+    # Compute eta / (sqrt(v_t) + tau) as a reciprocal and fold it into
+    # the multiply chain: the delta array is read once and never written,
+    # and the scalar ops ride along on the scratch buffer.
+    np.sqrt(v_t, out=scratch)
+    scratch += tau
+    np.reciprocal(scratch, out=scratch)
+    scratch *= eta
+    scratch *= agg
+    np.add(weights, scratch, out=weights)
+
+
+def adagrad_step(
+    agg: np.ndarray,
+    weights: np.ndarray,
+    v_t: np.ndarray,
+    scratch: np.ndarray,
+    eta: float,
+    tau: float,
+) -> None:
+    """Apply one Adagrad step in-place to `weights` and `v_t`.
+
+    Half-precision accumulators take the NumPy path, whose ufuncs upcast to
+    float32 for the arithmetic and cast back on store; Numba's CPU target
+    has no float16 support.
+    """
+    if _adagrad_step_jit is not None and v_t.dtype != np.float16:
+        _adagrad_step_jit(agg, weights, v_t, eta, tau)
+    else:
+        _adagrad_step_numpy(agg, weights, v_t, scratch, eta, tau)
@@ -33,6 +33,7 @@ from flwr.common import (
 )
 from flwr.server.client_proxy import ClientProxy
 
+from ._fedopt_kernels import adagrad_step
 from .fedopt import FedOpt
 
 
@@ -62,6 +63,7 @@ class FedAdagrad(FedOpt):
         eta: float = 1e-1,
         eta_l: float = 1e-1,
         tau: float = 1e-9,
+        half_precision_state: bool = False,
     ) -> None:
         """Federated learning strategy using Adagrad on server-side.
 
@@ -91,6 +93,11 @@ class FedAdagrad(FedOpt):
             eta_l (float, optional): Client-side learning rate. Defaults to 1e-1.
             tau (float, optional): Controls the algorithm's degree of adaptability.
                 Defaults to 1e-9.
+            half_precision_state (bool, optional): Store the v_t accumulator
+                in float16, halving its memory footprint and bandwidth. The
+                update itself is still computed in float32; since the sqrt
+                denominator dominates tau, the precision loss on v_t is
+                benign. Defaults to False.
         """
         super().__init__(
             fraction_fit=fraction_fit,
@@ -109,7 +116,17 @@ class FedAdagrad(FedOpt):
             beta_2=0.0,
             tau=tau,
         )
+        self.half_precision_state = half_precision_state
         self.v_t: Optional[Weights] = None
+        # Flattened state: the adaptive update runs as a single pass over one
+        # contiguous buffer instead of one pass per layer. Allocated lazily on
+        # the first aggregation, when the layer shapes are known.
+        self._shapes: Optional[List[Tuple[int, ...]]] = None
+        self._offsets: Optional[List[Tuple[int, int]]] = None
+        self._flat_weights: Optional[np.ndarray] = None
+        self._flat_vt: Optional[np.ndarray] = None
+        self._flat_agg: Optional[np.ndarray] = None
+        self._scratch: Optional[np.ndarray] = None
 
     def __repr__(self) -> str:
         rep = f"FedAdagrad(accept_failures={self.accept_failures})"
@@ -129,26 +146,128 @@ class FedAdagrad(FedOpt):
             return None, {}
 
         fedavg_weights_aggregate = parameters_to_weights(fedavg_parameters_aggregated)
-        aggregated_updates = [
-            subset_weights - self.current_weights[idx]
-            for idx, subset_weights in enumerate(fedavg_weights_aggregate)
-        ]
-
-        # Adagrad
-        delta_t = aggregated_updates
-        if not self.v_t:
-            self.v_t = [np.zeros_like(subset_weights) for subset_weights in delta_t]
+        if not self.current_weights:
+            # No reference weights to adapt against (empty initial
+            # parameters): adopt the plain FedAvg aggregate and start the
+            # adaptive updates from it next round
+            self.current_weights = fedavg_weights_aggregate
+            return fedavg_parameters_aggregated, metrics_aggregated
+        flat_weights, flat_vt, flat_agg, scratch = self._flat_state()
 
-        self.v_t = [
-            self.v_t[idx] + np.multiply(subset_weights, subset_weights)
-            for idx, subset_weights in enumerate(delta_t)
-        ]
+        # Flatten the aggregate into the preallocated contiguous buffer: a
+        # single elementwise pass over it beats per-layer passes on cache
+        # locality and loop overhead, and reusing the buffer leaves the
+        # adaptive update with zero per-round allocations. All layers are
+        # assumed to share one dtype, which holds for the float32 weights
+        # exchanged by clients.
+        np.concatenate(
+            [subset_weights.ravel() for subset_weights in fedavg_weights_aggregate],
+            out=flat_agg,
+        )
 
-        new_weights = [
-            self.current_weights[idx]
-            + self.eta * delta_t[idx] / (np.sqrt(self.v_t[idx]) + self.tau)
-            for idx in range(len(delta_t))
-        ]
-        self.current_weights = new_weights
+        # Adagrad: apply the fused elementwise update in-place to the flat
+        # weight and accumulator buffers.
+        adagrad_step(flat_agg, flat_weights, flat_vt, scratch, self.eta, self.tau)
 
         return weights_to_parameters(self.current_weights), metrics_aggregated
+
+    def aggregate_fit_async(
+        self,
+        rnd: int,  # pylint: disable=unused-argument
+        result: Tuple[ClientProxy, FitRes],
+        staleness: int,
+    ) -> Tuple[Optional[Parameters], Dict[str, Scalar]]:
+        """Fold a single client's fit result into the current weights.
+
+        Asynchronous counterpart to `aggregate_fit`: instead of waiting for
+        all selected clients, the server can commit each result as it
+        arrives, so round latency tracks the typical client instead of the
+        slowest straggler. The client's update is discounted by its staleness
+        (the number of rounds its base weights lag behind) with the FedAsync
+        weighting `alpha = 1 / (1 + staleness)`.
+
+        Args:
+            rnd (int): Current round number.
+            result (Tuple[ClientProxy, FitRes]): The arriving fit result.
+            staleness (int): Rounds elapsed since the client received the
+                weights it trained on. Zero means the result is current.
+
+        Returns:
+            The updated parameters and an empty metrics dict.
+        """
+        _, fit_res = result
+        client_weights = parameters_to_weights(fit_res.parameters)
+        if not self.current_weights:
+            # No reference weights to adapt against (empty initial
+            # parameters): adopt the arriving result and start the adaptive
+            # updates from it, mirroring aggregate_fit
+            self.current_weights = client_weights
+            return weights_to_parameters(self.current_weights), {}
+        flat_weights, flat_vt, delta, scratch = self._flat_state()
+
+        np.concatenate(
+            [subset_weights.ravel() for subset_weights in client_weights],
+            out=delta,
+        )
+        np.subtract(delta, flat_weights, out=delta)
+        # np.square reads delta once (np.multiply would read it per operand)
+        # and the scratch buffer keeps the accumulation in-place
+        np.square(delta, out=scratch)
+        flat_vt += scratch
+        alpha = 1.0 / (1.0 + staleness)
+        # Mirror _adagrad_step_numpy: routing the sqrt through the float32
+        # scratch buffer keeps the arithmetic in float32 even when v_t is
+        # stored in float16 (where adding tau would underflow and yield 0/0
+        # NaNs), and the fused reciprocal chain avoids allocating full-model
+        # temporaries for the step
+        np.sqrt(flat_vt, out=scratch)
+        scratch += self.tau
+        np.reciprocal(scratch, out=scratch)
+        scratch *= alpha * self.eta
+        scratch *= delta
+        flat_weights += scratch
+
+        return weights_to_parameters(self.current_weights), {}
+
+    def _flat_state(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return the flattened (weights, v_t, aggregate, scratch) buffers,
+        setting them up on first use."""
+        if (
+            self._flat_weights is not None
+            and self._flat_vt is not None
+            and self._flat_agg is not None
+            and self._scratch is not None
+        ):
+            return self._flat_weights, self._flat_vt, self._flat_agg, self._scratch
+
+        self._shapes = [subset_weights.shape for subset_weights in self.current_weights]
+        offsets = []
+        start = 0
+        for subset_weights in self.current_weights:
+            offsets.append((start, start + subset_weights.size))
+            start += subset_weights.size
+        self._offsets = offsets
+        flat_weights = np.concatenate(
+            [subset_weights.ravel() for subset_weights in self.current_weights]
+        )
+        flat_vt = np.zeros(
+            flat_weights.size,
+            dtype=np.float16 if self.half_precision_state else flat_weights.dtype,
+        )
+        flat_agg = np.empty_like(flat_weights)
+        scratch = np.empty_like(flat_weights)
+        self._flat_weights = flat_weights
+        self._flat_vt = flat_vt
+        self._flat_agg = flat_agg
+        self._scratch = scratch
+        # Per-layer views into the flat buffers: updating the flat arrays
+        # in-place keeps these (and thus `current_weights`/`v_t`) current.
+        self.current_weights = [
+            flat_weights[start:end].reshape(shape)
+            for (start, end), shape in zip(offsets, self._shapes)
+        ]
+        self.v_t = [
+            flat_vt[start:end].reshape(shape)
+            for (start, end), shape in zip(offsets, self._shapes)
+        ]
+        return flat_weights, flat_vt, flat_agg, scratch
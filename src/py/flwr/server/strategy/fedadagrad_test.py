@@ -18,6 +18,7 @@
 from typing import List, Tuple
 from unittest.mock import MagicMock
 
+import numpy as np
 from numpy import array, float32
 
 from flwr.common import (
@@ -70,3 +71,76 @@ def test_aggregate_fit() -> None:
         actual_list = parameters_to_weights(actual_aggregated)
         actual = actual_list[0]
     assert (actual == expected[0]).all()
+
+
+def test_aggregate_fit_half_precision_state() -> None:
+    """Tests aggregation with the v_t accumulator stored in float16."""
+    # Prepare
+    previous_weights: Weights = [array([0.1, 0.1, 0.1, 0.1], dtype=float32)]
+    strategy = FedAdagrad(
+        eta=0.1,
+        eta_l=0.316,
+        tau=0.5,
+        initial_parameters=weights_to_parameters(previous_weights),
+        half_precision_state=True,
+    )
+    param_0: Parameters = weights_to_parameters(
+        [array([0.2, 0.2, 0.2, 0.2], dtype=float32)]
+    )
+    param_1: Parameters = weights_to_parameters(
+        [array([1.0, 1.0, 1.0, 1.0], dtype=float32)]
+    )
+    bridge = MagicMock()
+    client_0 = GrpcClientProxy(cid="0", bridge=bridge)
+    client_1 = GrpcClientProxy(cid="1", bridge=bridge)
+    results: List[Tuple[ClientProxy, FitRes]] = [
+        (
+            client_0,
+            FitRes(param_0, num_examples=5, num_examples_ceil=5, fit_duration=0.1),
+        ),
+        (
+            client_1,
+            FitRes(param_1, num_examples=5, num_examples_ceil=5, fit_duration=0.1),
+        ),
+    ]
+    expected: Weights = [array([0.15, 0.15, 0.15, 0.15], dtype=float32)]
+
+    # Execute
+    actual_aggregated, _ = strategy.aggregate_fit(rnd=1, results=results, failures=[])
+    if actual_aggregated:
+        actual_list = parameters_to_weights(actual_aggregated)
+        actual = actual_list[0]
+    np.testing.assert_allclose(actual, expected[0], rtol=1e-3)
+
+
+def test_aggregate_fit_async() -> None:
+    """Tests if a single stale result is folded in with discounted weight."""
+    # Prepare
+    previous_weights: Weights = [array([0.1, 0.1, 0.1, 0.1], dtype=float32)]
+    strategy = FedAdagrad(
+        eta=0.1,
+        eta_l=0.316,
+        tau=0.4,
+        initial_parameters=weights_to_parameters(previous_weights),
+    )
+    param: Parameters = weights_to_parameters(
+        [array([0.2, 0.2, 0.2, 0.2], dtype=float32)]
+    )
+    bridge = MagicMock()
+    client = GrpcClientProxy(cid="0", bridge=bridge)
+    result: Tuple[ClientProxy, FitRes] = (
+        client,
+        FitRes(param, num_examples=5, num_examples_ceil=5, fit_duration=0.1),
+    )
+    # delta = 0.1, v_t = 0.01, alpha = 1 / (1 + 1) = 0.5:
+    # 0.1 + 0.5 * 0.1 * 0.1 / (sqrt(0.01) + 0.4) = 0.11
+    expected: Weights = [array([0.11, 0.11, 0.11, 0.11], dtype=float32)]
+
+    # Execute
+    actual_aggregated, _ = strategy.aggregate_fit_async(
+        rnd=1, result=result, staleness=1
+    )
+    if actual_aggregated:
+        actual_list = parameters_to_weights(actual_aggregated)
+        actual = actual_list[0]
+    np.testing.assert_allclose(actual, expected[0], rtol=1e-6)
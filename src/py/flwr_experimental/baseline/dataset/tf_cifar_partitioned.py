@@ -15,7 +15,7 @@
 """Partitioned versions of CIFAR-10/100 datasets."""
 # pylint: disable=invalid-name
 
-from typing import Tuple
+from typing import Optional, Tuple
 
 import tensorflow as tf
 
@@ -28,12 +28,23 @@ from .dataset import (
 
 
 def load_data(
-    iid_fraction: float, num_partitions: int, cifar100: bool = False
+    iid_fraction: float,
+    num_partitions: int,
+    cifar100: bool = False,
+    max_test: Optional[int] = None,
 ) -> Tuple[PartitionedDataset, XY]:
-    """Load partitioned version of CIFAR-10/100."""
+    """Load partitioned version of CIFAR-10/100.
+
+    If `max_test` is set, only the first `max_test` test examples are kept,
+    which avoids partitioning (and holding in memory) the full test set for
+    dry runs.
+    """
     cifar = tf.keras.datasets.cifar100 if cifar100 else tf.keras.datasets.cifar10
+    xy_train, (x_test, y_test) = cifar.load_data()
+    if max_test is not None:
+        x_test, y_test = x_test[:max_test], y_test[:max_test]
     (xy_train_partitions, xy_test_partitions), xy_test = create_partitioned_dataset(
-        cifar.load_data(), iid_fraction, num_partitions
+        (xy_train, (x_test, y_test)), iid_fraction, num_partitions
     )
     return (xy_train_partitions, xy_test_partitions), xy_test
 
@@ -18,13 +18,14 @@
 import argparse
 import math
 from logging import ERROR, INFO
-from typing import Callable, Dict, Optional
+from typing import Callable, Dict, Optional, Tuple
 
 import flwr as fl
 from flwr.common.logger import configure, log
 from flwr_experimental.baseline.common import get_eval_fn
 from flwr_experimental.baseline.dataset import tf_cifar_partitioned
 from flwr_experimental.baseline.model import resnet50v2
+from flwr_experimental.baseline.setting import ServerSetting
 from flwr_experimental.baseline.tf_cifar.settings import SETTINGS, get_setting
 
 from . import DEFAULT_SERVER_ADDRESS, NUM_CLASSES, SEED
@@ -58,13 +59,13 @@ def main() -> None:
     server_setting = get_setting(args.setting).server
     log(INFO, "server_setting: %s", server_setting)
 
-    # Load evaluation data
+    # Load evaluation data (only 50 examples for dry runs)
     (_, _), (x_test, y_test) = tf_cifar_partitioned.load_data(
-        iid_fraction=0.0, num_partitions=1, cifar100=NUM_CLASSES == 100
+        iid_fraction=0.0,
+        num_partitions=1,
+        cifar100=NUM_CLASSES == 100,
+        max_test=50 if server_setting.dry_run else None,
     )
-    if server_setting.dry_run:
-        x_test = x_test[0:50]
-        y_test = y_test[0:50]
 
     # Load model (for centralized evaluation)
     model = resnet50v2(input_shape=(32, 32, 3), num_classes=NUM_CLASSES, seed=SEED)
@@ -79,35 +80,12 @@ def main() -> None:
         partial_updates=server_setting.partial_updates,
     )
 
-    if server_setting.strategy == "fedavg":
-        strategy = fl.server.strategy.FedAvg(
-            fraction_fit=server_setting.sample_fraction,
-            min_fit_clients=server_setting.min_sample_size,
-            min_available_clients=server_setting.min_num_clients,
-            eval_fn=eval_fn,
-            on_fit_config_fn=fit_config_fn,
-        )
-
-    if server_setting.strategy == "fast-and-slow":
-        if server_setting.training_round_timeout is None:
-            raise ValueError(
-                "No `training_round_timeout` set for `fast-and-slow` strategy"
-            )
-        strategy = fl.server.strategy.FastAndSlow(
-            fraction_fit=server_setting.sample_fraction,
-            min_fit_clients=server_setting.min_sample_size,
-            min_available_clients=server_setting.min_num_clients,
-            eval_fn=eval_fn,
-            on_fit_config_fn=fit_config_fn,
-            importance_sampling=server_setting.importance_sampling,
-            dynamic_timeout=server_setting.dynamic_timeout,
-            dynamic_timeout_percentile=0.8,
-            alternating_timeout=server_setting.alternating_timeout,
-            r_fast=1,
-            r_slow=1,
-            t_fast=math.ceil(0.5 * server_setting.training_round_timeout),
-            t_slow=server_setting.training_round_timeout,
-        )
+    # Only the builder for the configured strategy runs, and an unknown
+    # strategy name fails with a KeyError here instead of an unbound
+    # `strategy` further down
+    strategy = STRATEGY_BUILDERS[server_setting.strategy](
+        server_setting, eval_fn, fit_config_fn
+    )
 
     # Run server
     fl.server.start_server(
@@ -117,24 +95,74 @@ def main() -> None:
     )
 
 
+EvalFn = Callable[[fl.common.Weights], Optional[Tuple[float, float]]]
+FitConfigFn = Callable[[int], Dict[str, fl.common.Scalar]]
+
+
+def build_fedavg(
+    server_setting: ServerSetting, eval_fn: EvalFn, fit_config_fn: FitConfigFn
+) -> fl.server.strategy.Strategy:
+    """Build a FedAvg strategy from the server setting."""
+    return fl.server.strategy.FedAvg(
+        fraction_fit=server_setting.sample_fraction,
+        min_fit_clients=server_setting.min_sample_size,
+        min_available_clients=server_setting.min_num_clients,
+        eval_fn=eval_fn,
+        on_fit_config_fn=fit_config_fn,
+    )
+
+
+def build_fast_and_slow(
+    server_setting: ServerSetting, eval_fn: EvalFn, fit_config_fn: FitConfigFn
+) -> fl.server.strategy.Strategy:
+    """Build a FastAndSlow strategy from the server setting."""
+    if server_setting.training_round_timeout is None:
+        raise ValueError("No `training_round_timeout` set for `fast-and-slow` strategy")
+    return fl.server.strategy.FastAndSlow(
+        fraction_fit=server_setting.sample_fraction,
+        min_fit_clients=server_setting.min_sample_size,
+        min_available_clients=server_setting.min_num_clients,
+        eval_fn=eval_fn,
+        on_fit_config_fn=fit_config_fn,
+        importance_sampling=server_setting.importance_sampling,
+        dynamic_timeout=server_setting.dynamic_timeout,
+        dynamic_timeout_percentile=0.8,
+        alternating_timeout=server_setting.alternating_timeout,
+        r_fast=1,
+        r_slow=1,
+        t_fast=math.ceil(0.5 * server_setting.training_round_timeout),
+        t_slow=server_setting.training_round_timeout,
+    )
+
+
+STRATEGY_BUILDERS: Dict[
+    str, Callable[[ServerSetting, EvalFn, FitConfigFn], fl.server.strategy.Strategy]
+] = {
+    "fedavg": build_fedavg,
+    "fast-and-slow": build_fast_and_slow,
+}
+
+
 def get_on_fit_config_fn(
     lr_initial: float, timeout: Optional[int], partial_updates: bool
 ) -> Callable[[int], Dict[str, fl.common.Scalar]]:
     """Return a function which returns training configurations."""
+    # Every key except epoch_global is round-independent, so stringify them
+    # once instead of on every call (rounds x clients times per run)
+    static_config: Dict[str, fl.common.Scalar] = {
+        "epochs": str(1),
+        "batch_size": str(32),
+        "lr_initial": str(lr_initial),
+        "lr_decay": str(0.99),
+        "partial_updates": "1" if partial_updates else "0",
+    }
+    if timeout is not None:
+        static_config["timeout"] = str(timeout)
 
     def fit_config(rnd: int) -> Dict[str, fl.common.Scalar]:
         """Return a configuration with static batch size and (local) epochs."""
-        config: Dict[str, fl.common.Scalar] = {
-            "epoch_global": str(rnd),
-            "epochs": str(1),
-            "batch_size": str(32),
-            "lr_initial": str(lr_initial),
-            "lr_decay": str(0.99),
-            "partial_updates": "1" if partial_updates else "0",
-        }
-        if timeout is not None:
-            config["timeout"] = str(timeout)
-
+        config = static_config.copy()
+        config["epoch_global"] = str(rnd)
         return config
 
     return fit_config